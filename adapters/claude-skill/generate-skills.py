@@ -5,14 +5,45 @@ This adapter converts agents with runtime.mode: preload into Claude Code's
 native skill format for automatic keyword activation.
 """
 
+import functools
+import hashlib
+import json
+import os
 import yaml
 import shutil
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # optional: pip install pleiades-agents[fast]
+    orjson = None
+
 # Paths
 REPO_ROOT = Path(__file__).parent.parent.parent
 AGENTS_DIR = REPO_ROOT / "agents"
 OUTPUT_DIR = REPO_ROOT / ".claude" / "skills"
+MANIFEST_PATH = OUTPUT_DIR / ".manifest.json"
+
+# JSON copy of config.yaml that the MCP server loads instead of the YAML
+COMPILED_CONFIG_NAME = ".config.json"
+
+# Prefer libyaml's C parser/emitter when PyYAML was built with it
+SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+SafeDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+
+def json_dumps(obj) -> bytes:
+    """Serialize to indented, key-sorted JSON, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS) + b"\n"
+    return (json.dumps(obj, indent=2, sort_keys=True) + "\n").encode()
+
+
+def json_loads(data: bytes):
+    """Parse JSON, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
 
 def should_generate_skill(config: dict) -> bool:
@@ -23,86 +54,233 @@ def should_generate_skill(config: dict) -> bool:
     return mode == "preload"
 
 
-def generate_skill_md(config: dict, agent_md: str) -> str:
-    """Generate Claude Code SKILL.md format with YAML frontmatter."""
-    # Build frontmatter
+@functools.lru_cache(maxsize=None)
+def _dump_frontmatter(
+    name: str, description: str, keywords: tuple, model: str | None
+) -> str:
+    """Serialize SKILL.md frontmatter, memoized on its fields."""
     frontmatter = {
-        "name": config["name"],
-        "description": config["description"],
-        "keywords": config.get("triggers", {}).get("keywords", []),
+        "name": name,
+        "description": description,
+        "keywords": list(keywords),
         "activation": "keywords",
     }
+    if model:
+        frontmatter["model"] = model
+
+    return yaml.dump(
+        frontmatter, Dumper=SafeDumper, default_flow_style=False, sort_keys=False
+    )
+
+
+def generate_skill_md(config: dict, agent_md: str) -> str:
+    """Generate Claude Code SKILL.md format with YAML frontmatter."""
+    keywords = config.get("triggers", {}).get("keywords") or []
 
     # Add model hint if requires_opus
-    if config.get("requires_opus"):
-        frontmatter["model"] = "opus-4"
+    model = "opus-4" if config.get("requires_opus") else None
 
     # Generate YAML frontmatter
-    yaml_str = yaml.dump(frontmatter, default_flow_style=False, sort_keys=False)
+    yaml_str = _dump_frontmatter(
+        config["name"], config["description"], tuple(keywords), model
+    )
 
     # Combine frontmatter and content
     return f"---\n{yaml_str}---\n\n{agent_md}"
 
 
-def generate_skill(agent_dir: Path) -> bool:
-    """Generate a Claude skill from an agent directory."""
+def hash_agent_inputs(agent_dir: Path) -> str | None:
+    """Hash config.yaml and AGENT.md without parsing either."""
+    try:
+        digest = hashlib.sha256((agent_dir / "config.yaml").read_bytes())
+    except FileNotFoundError:
+        return None
+
+    digest.update(b"\0")
+    try:
+        digest.update((agent_dir / "AGENT.md").read_bytes())
+    except FileNotFoundError:
+        pass
+    return digest.hexdigest()
+
+
+def load_manifest() -> dict:
+    """Load the previous run's manifest, or an empty one."""
+    try:
+        manifest = json_loads(MANIFEST_PATH.read_bytes())
+    except (FileNotFoundError, ValueError):
+        return {}
+
+    # Output produced by a different version of this script is stale
+    if manifest.get("generator") != hashlib.sha256(Path(__file__).read_bytes()).hexdigest():
+        return {}
+    return manifest
+
+
+def write_file_at(dir_fd: int, rel_path: str, data: bytes) -> None:
+    """Write data to a path relative to an open directory descriptor."""
+    fd = os.open(rel_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644, dir_fd=dir_fd)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+def compile_config(config_path: Path, config: dict, st: os.stat_result) -> None:
+    """Write a JSON copy of config.yaml stamped with the source mtime and size.
+
+    st must come from the handle config was parsed from, so a later edit
+    can't stamp the new file's identity onto the old content.
+    """
+    try:
+        data = json_dumps({"source": [st.st_mtime_ns, st.st_size], "config": config})
+    except (TypeError, ValueError):
+        return
+
+    # JSON silently turns dates into strings and int keys into string keys;
+    # such configs stay on the YAML path so both load the same data
+    if json_loads(data)["config"] != config:
+        return
+    (config_path.parent / COMPILED_CONFIG_NAME).write_bytes(data)
+
+
+def ensure_compiled_config(config_path: Path) -> None:
+    """Recompile config.yaml if its JSON copy is missing or stamped stale.
+
+    Unchanged content can still get a new mtime (checkouts, stashes), and
+    the MCP server rejects a copy whose stamp doesn't match.
+    """
+    st = os.stat(config_path)
+    try:
+        compiled = json_loads((config_path.parent / COMPILED_CONFIG_NAME).read_bytes())
+    except (FileNotFoundError, ValueError):
+        compiled = None
+    if isinstance(compiled, dict) and compiled.get("source") == [st.st_mtime_ns, st.st_size]:
+        return
+
+    with open(config_path, "rb") as f:
+        config = yaml.load(f, Loader=SafeLoader)
+        st = os.fstat(f.fileno())
+    compile_config(config_path, config, st)
+
+
+def generate_skill(agent_dir: Path, dir_fd: int) -> str | None:
+    """Generate a Claude skill from an agent directory.
+
+    Files are created relative to dir_fd, an open descriptor for OUTPUT_DIR.
+    Returns the skill name, or None if the agent is not a skill.
+    """
     config_path = agent_dir / "config.yaml"
     agent_path = agent_dir / "AGENT.md"
 
-    if not config_path.exists():
-        return False
-
     # Load config
-    with open(config_path) as f:
-        config = yaml.safe_load(f)
+    try:
+        with open(config_path, "rb") as f:
+            config = yaml.load(f, Loader=SafeLoader)
+            st = os.fstat(f.fileno())
+    except FileNotFoundError:
+        return None
+
+    compile_config(config_path, config, st)
 
     # Check if this should be a skill
     if not should_generate_skill(config):
-        return False
+        return None
 
     # Load agent instructions
-    agent_md = ""
-    if agent_path.exists():
-        agent_md = agent_path.read_text()
+    try:
+        agent_md = agent_path.read_bytes().decode("utf-8", errors="replace")
+    except FileNotFoundError:
+        agent_md = ""
 
     # Generate skill content
     skill_content = generate_skill_md(config, agent_md)
 
     # Create output directory
-    skill_dir = OUTPUT_DIR / config["name"]
-    skill_dir.mkdir(parents=True, exist_ok=True)
+    try:
+        os.mkdir(config["name"], dir_fd=dir_fd)
+    except FileExistsError:
+        pass
 
     # Write SKILL.md
-    skill_path = skill_dir / "SKILL.md"
-    skill_path.write_text(skill_content)
+    write_file_at(dir_fd, f"{config['name']}/SKILL.md", skill_content.encode())
 
-    return True
+    return config["name"]
 
 
 def main():
     print("Generating Claude Code skills from unified agents...\n")
 
-    # Clean existing skills
-    if OUTPUT_DIR.exists():
+    # Without a manifest we can't tell what we own, so start clean
+    previous = load_manifest().get("agents", {})
+    if not previous and OUTPUT_DIR.exists():
         shutil.rmtree(OUTPUT_DIR)
-    OUTPUT_DIR.mkdir(parents=True)
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
     # Process all agents
     generated = 0
+    unchanged = 0
     skipped = 0
+    current = {}
+
+    with os.scandir(AGENTS_DIR) as it:
+        entries = sorted((e for e in it if e.is_dir()), key=lambda e: e.name)
+
+    # Resolve OUTPUT_DIR once; skill files are created relative to it
+    dir_fd = os.open(OUTPUT_DIR, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        for entry in entries:
+            agent_dir = Path(entry.path)
+            digest = hash_agent_inputs(agent_dir)
+            cached = previous.get(entry.name)
+
+            # Reuse the previous result if neither input file changed
+            if (
+                digest is not None
+                and cached is not None
+                and cached["hash"] == digest
+                and (cached["skill"] is None or (OUTPUT_DIR / cached["skill"] / "SKILL.md").exists())
+            ):
+                skill_name = cached["skill"]
+                fresh = False
+                ensure_compiled_config(agent_dir / "config.yaml")
+            else:
+                skill_name = generate_skill(agent_dir, dir_fd)
+                fresh = True
+
+            if digest is not None:
+                current[entry.name] = {"hash": digest, "skill": skill_name}
+
+            if skill_name and fresh:
+                print(f"  [OK] {entry.name}")
+                generated += 1
+            elif skill_name:
+                print(f"  [OK] {entry.name} (unchanged)")
+                unchanged += 1
+            else:
+                print(f"  [SKIP] {entry.name} (on-demand mode)")
+                skipped += 1
+    finally:
+        os.close(dir_fd)
 
-    for agent_dir in sorted(AGENTS_DIR.iterdir()):
-        if not agent_dir.is_dir():
-            continue
+    # Remove skills whose agents were deleted or are no longer preload
+    stale = {e["skill"] for e in previous.values() if e["skill"]}
+    stale -= {e["skill"] for e in current.values() if e["skill"]}
+    for skill_name in sorted(stale):
+        shutil.rmtree(OUTPUT_DIR / skill_name, ignore_errors=True)
+        print(f"  [DEL] {skill_name}")
 
-        if generate_skill(agent_dir):
-            print(f"  [OK] {agent_dir.name}")
-            generated += 1
-        else:
-            print(f"  [SKIP] {agent_dir.name} (on-demand mode)")
-            skipped += 1
+    MANIFEST_PATH.write_bytes(json_dumps({
+        "generator": hashlib.sha256(Path(__file__).read_bytes()).hexdigest(),
+        "agents": current,
+    }))
 
-    print(f"\nGenerated {generated} skills, skipped {skipped} on-demand agents")
+    print(
+        f"\nGenerated {generated} skills ({unchanged} unchanged), "
+        f"skipped {skipped} on-demand agents"
+    )
     print(f"Output: {OUTPUT_DIR}")
 
 
@@ -1,15 +1,44 @@
 """Dynamic agent loader for unified agent format."""
 
+import hashlib
+import json
 import logging
+import os
+import pickle
 import yaml
-from dataclasses import dataclass
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+try:
+    import ahocorasick
+except ImportError:  # optional: pip install pleiades-agents[fast]
+    ahocorasick = None
+
+try:
+    import orjson
+except ImportError:  # optional: pip install pleiades-agents[fast]
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Prefer libyaml's C parser when PyYAML was built with it
+SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# JSON copy of config.yaml written by adapters/claude-skill/generate-skills.py
+COMPILED_CONFIG_NAME = ".config.json"
+
+# Bump whenever the pickled Agent layout changes to invalidate old caches
+CACHE_VERSION = 4
+
+# Caches written by a different version of this module (e.g. with other
+# parsing rules) are stale even if no agent file changed
+LOADER_DIGEST = hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
+
 
-@dataclass
+@dataclass(slots=True)
 class AgentContext:
     """Context information for agent execution."""
 
@@ -19,9 +48,15 @@ class AgentContext:
     severity: Optional[str] = None
     user_preferences: Optional[Dict[str, Any]] = None
     additional_context: Optional[Dict[str, Any]] = None
+    # Lowercased task_description, computed once and shared by matchers
+    task_lower: str = field(default="", repr=False)
 
+    def __post_init__(self):
+        if not self.task_lower:
+            self.task_lower = self.task_description.lower()
 
-@dataclass
+
+@dataclass(slots=True)
 class AgentResult:
     """Result from agent execution."""
 
@@ -42,6 +77,22 @@ class Agent:
     with a configuration-driven approach.
     """
 
+    __slots__ = (
+        "name",
+        "description",
+        "tier",
+        "category",
+        "keywords",
+        "_keywords_lower",
+        "_keywords_pairs",
+        "requires_opus",
+        "delegates_to",
+        "runtime_mode",
+        "_inst",
+        "_instructions_path",
+        "logger",
+    )
+
     def __init__(
         self,
         name: str,
@@ -53,32 +104,74 @@ class Agent:
         delegates_to: Optional[List[str]] = None,
         runtime_mode: str = "on-demand",
         instructions: str = "",
+        instructions_path: Optional[Path] = None,
     ):
         self.name = name
         self.description = description
         self.tier = tier
         self.category = category
         self.keywords = keywords
+        # Keywords are immutable after load, so lowercase them once here
+        self._keywords_lower = tuple(kw.lower() for kw in keywords)
+        self._keywords_pairs = tuple(zip(self._keywords_lower, keywords))
         self.requires_opus = requires_opus
         self.delegates_to = delegates_to or []
         self.runtime_mode = runtime_mode
-        self.instructions = instructions
+        # AGENT.md is only read the first time instructions are requested
+        self._inst: Optional[str] = instructions or None
+        self._instructions_path = instructions_path
         self.logger = logging.getLogger(f"pleiades.{name}")
 
-    def can_handle(self, task_description: str) -> bool:
+    def __getstate__(self) -> Dict[str, Any]:
+        state = {slot: getattr(self, slot) for slot in self.__slots__ if slot != "logger"}
+        if self._instructions_path is not None:
+            state["_inst"] = None
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]):
+        for key, value in state.items():
+            setattr(self, key, value)
+        self.logger = logging.getLogger(f"pleiades.{self.name}")
+
+    @property
+    def instructions(self) -> str:
+        """Agent instructions from AGENT.md, read on first access."""
+        if self._inst is None and self._instructions_path is not None:
+            try:
+                self._inst = self._instructions_path.read_bytes().decode("utf-8", errors="replace")
+            except FileNotFoundError:
+                self.logger.warning(f"AGENT.md disappeared: {self._instructions_path}")
+                self._instructions_path = None
+        return self._inst or ""
+
+    @property
+    def has_instructions(self) -> bool:
+        """Check whether instructions are available without reading them."""
+        return self._inst is not None or self._instructions_path is not None
+
+    def can_handle(self, task_description: str, task_lower: Optional[str] = None) -> bool:
         """Check if this agent can handle the given task."""
-        task_lower = task_description.lower()
-        return any(keyword.lower() in task_lower for keyword in self.keywords)
+        if task_lower is None:
+            task_lower = task_description.lower()
+        return any(kw in task_lower for kw in self._keywords_lower)
 
-    def get_match_score(self, task_description: str) -> int:
+    def get_match_score(self, task_description: str, task_lower: Optional[str] = None) -> int:
         """Get the number of matching keywords."""
-        task_lower = task_description.lower()
-        return sum(1 for kw in self.keywords if kw.lower() in task_lower)
+        if task_lower is None:
+            task_lower = task_description.lower()
+        return self._score_lowered(task_lower)
 
-    def get_matched_keywords(self, task_description: str) -> List[str]:
+    def _score_lowered(self, task_lower: str) -> int:
+        """Get the number of matching keywords for an already-lowercased task."""
+        return sum(1 for kw in self._keywords_lower if kw in task_lower)
+
+    def get_matched_keywords(
+        self, task_description: str, task_lower: Optional[str] = None
+    ) -> List[str]:
         """Get list of matched keywords."""
-        task_lower = task_description.lower()
-        return [kw for kw in self.keywords if kw.lower() in task_lower]
+        if task_lower is None:
+            task_lower = task_description.lower()
+        return [kw for kw_lower, kw in self._keywords_pairs if kw_lower in task_lower]
 
     def run(self, context: AgentContext) -> AgentResult:
         """
@@ -95,7 +188,9 @@ class Agent:
             "tier": self.tier,
             "category": self.category,
             "task": context.task_description,
-            "matched_keywords": self.get_matched_keywords(context.task_description),
+            "matched_keywords": self.get_matched_keywords(
+                context.task_description, task_lower=context.task_lower
+            ),
             "severity": context.severity,
             "environment": context.environment,
         }
@@ -141,84 +236,278 @@ class AgentLoader:
             # Default to agents/ relative to repo root
             agents_dir = Path(__file__).parent.parent.parent.parent / "agents"
         self.agents_dir = agents_dir
+        self._cache_path = self._default_cache_path(agents_dir)
         self._agents: Dict[str, Agent] = {}
+        self._agent_order: Dict[str, int] = {}
+        self._sorted_agent_names: List[str] = []
+        self._info_cache: Dict[str, Dict[str, Any]] = {}
+        self._by_tier: Dict[str, List[Agent]] = {}
+        self._by_category: Dict[str, List[Agent]] = {}
+        self._automaton = None
+        self._version = 0
         self.logger = logging.getLogger("pleiades.loader")
         self._load_agents()
 
+    @property
+    def version(self) -> int:
+        """Counter bumped on every (re)load, for invalidating derived caches."""
+        return self._version
+
+    def reload(self):
+        """Re-read all agents from disk and rebuild the indexes."""
+        self._agents = {}
+        self._automaton = None
+        self._load_agents()
+
     def _load_agents(self):
         """Load all agents from the agents directory."""
-        if not self.agents_dir.exists():
+        self._version += 1
+
+        # scandir caches the entry type from readdir, avoiding a stat per agent
+        try:
+            with os.scandir(self.agents_dir) as it:
+                entries = sorted((e for e in it if e.is_dir()), key=lambda e: e.name)
+        except FileNotFoundError:
             self.logger.warning(f"Agents directory not found: {self.agents_dir}")
+            self._build_indexes()
             return
 
-        for agent_dir in sorted(self.agents_dir.iterdir()):
-            if not agent_dir.is_dir():
-                continue
-
-            config_path = agent_dir / "config.yaml"
-            agent_path = agent_dir / "AGENT.md"
-
-            if not config_path.exists():
-                self.logger.debug(f"Skipping {agent_dir.name}: no config.yaml")
-                continue
+        pairs = [
+            (entry.name, Path(entry.path) / "config.yaml", Path(entry.path) / "AGENT.md")
+            for entry in entries
+        ]
+
+        # Warm start: reuse the previous parse if no input file has changed
+        fingerprint = self._fingerprint(pairs)
+        cached = self._read_cache(fingerprint)
+        if cached is not None:
+            self._agents = cached
+            self.logger.info(f"Loaded {len(self._agents)} agents from cache")
+        else:
+            self._parse_agents(pairs)
+            self._write_cache(fingerprint)
+
+        self._build_indexes()
+
+    def _parse_agents(self, pairs: List[tuple]):
+        """Parse every agent directory into self._agents."""
+        # Overlap file reads and YAML parsing; results are collected in
+        # directory order on this thread so no locking is needed.
+        max_workers = min(32, (os.cpu_count() or 1) * 4)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                (dir_name, executor.submit(self._load_agent, config_path, agent_path))
+                for dir_name, config_path, agent_path in pairs
+            ]
 
+        for dir_name, future in futures:
             try:
-                agent = self._load_agent(config_path, agent_path)
+                agent = future.result()
                 if agent:
                     self._agents[agent.name] = agent
+            except FileNotFoundError:
+                self.logger.debug(f"Skipping {dir_name}: no config.yaml")
             except Exception as e:
-                self.logger.error(f"Failed to load agent {agent_dir.name}: {e}")
+                self.logger.error(f"Failed to load agent {dir_name}: {e}")
 
         self.logger.info(f"Loaded {len(self._agents)} agents")
 
+    def _build_indexes(self):
+        """Precompute the lookups served to MCP tool handlers."""
+        self._agent_order = {name: i for i, name in enumerate(self._agents)}
+        self._sorted_agent_names = sorted(self._agents)
+
+        info_cache = {}
+        by_tier = defaultdict(list)
+        by_category = defaultdict(list)
+        for name in self._sorted_agent_names:
+            agent = self._agents[name]
+            info_cache[name] = {
+                "name": agent.name,
+                "description": agent.description,
+                "tier": agent.tier,
+                "category": agent.category,
+                "keywords": agent.keywords,
+                "requires_opus": agent.requires_opus,
+                "delegates_to": agent.delegates_to,
+                "runtime_mode": agent.runtime_mode,
+            }
+            by_tier[agent.tier].append(agent)
+            by_category[agent.category].append(agent)
+        self._info_cache = info_cache
+        self._by_tier = by_tier
+        self._by_category = by_category
+
+        self._build_keyword_index()
+
+    def _build_keyword_index(self):
+        """Compile all agent keywords into one Aho-Corasick automaton."""
+        if ahocorasick is None:
+            return
+
+        # A keyword may be shared by several agents (or repeated in one)
+        owners: Dict[str, List[str]] = {}
+        for agent in self._agents.values():
+            for kw in agent._keywords_lower:
+                if kw:
+                    owners.setdefault(kw, []).append(agent.name)
+        if not owners:
+            return
+
+        automaton = ahocorasick.Automaton()
+        for kw, names in owners.items():
+            automaton.add_word(kw, (kw, names))
+        automaton.make_automaton()
+        self._automaton = automaton
+
+    @staticmethod
+    def _fingerprint(pairs: List[tuple]) -> Dict[str, tuple]:
+        """Map each agent input file to its (mtime_ns, size)."""
+        fingerprint = {}
+        for _, config_path, agent_path in pairs:
+            for path in (config_path, agent_path):
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                fingerprint[str(path)] = (st.st_mtime_ns, st.st_size)
+        return fingerprint
+
+    @staticmethod
+    def _default_cache_path(agents_dir: Path) -> Path:
+        """Per-user cache file for an agents directory, kept out of the repo.
+
+        Unpickling runs code, so the cache must never travel with a checkout.
+        """
+        cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        key = hashlib.blake2b(str(agents_dir.resolve()).encode(), digest_size=16).hexdigest()
+        return Path(cache_home) / "pleiades-agents" / f"agents-{key}.pkl"
+
+    @staticmethod
+    def _is_private(st: os.stat_result) -> bool:
+        """True if a file is owned by this user and not writable by others."""
+        if not hasattr(os, "getuid"):
+            return True
+        return st.st_uid == os.getuid() and not st.st_mode & 0o022
+
+    def _read_cache(self, fingerprint: Dict[str, tuple]) -> Optional[Dict[str, Agent]]:
+        """Return cached agents if the cache matches the fingerprint."""
+        try:
+            with open(self._cache_path, "rb") as f:
+                if not self._is_private(os.fstat(f.fileno())):
+                    self.logger.warning(f"Ignoring agent cache not private to this user: {self._cache_path}")
+                    return None
+                version, digest, cached_fingerprint, agents = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            self.logger.debug(f"Ignoring unreadable agent cache: {e}")
+            return None
+
+        if version != CACHE_VERSION or digest != LOADER_DIGEST or cached_fingerprint != fingerprint:
+            return None
+        return agents
+
+    def _write_cache(self, fingerprint: Dict[str, tuple]):
+        """Persist parsed agents alongside the fingerprint they came from."""
+        tmp_path = self._cache_path.with_name(self._cache_path.name + ".tmp")
+        try:
+            self._cache_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump((CACHE_VERSION, LOADER_DIGEST, fingerprint, self._agents), f, protocol=5)
+            os.replace(tmp_path, self._cache_path)
+        except OSError as e:
+            self.logger.debug(f"Could not write agent cache: {e}")
+
+    @staticmethod
+    def _load_compiled_config(config_path: Path) -> Optional[Dict[str, Any]]:
+        """Return the precompiled JSON config if it matches config.yaml."""
+        # Raises FileNotFoundError when config.yaml itself is missing
+        st = os.stat(config_path)
+        try:
+            with open(config_path.parent / COMPILED_CONFIG_NAME, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+
+        try:
+            compiled = orjson.loads(data) if orjson is not None else json.loads(data)
+        except ValueError:
+            return None
+
+        # Anything but a well-formed, matching copy falls back to the YAML
+        if not isinstance(compiled, dict) or compiled.get("source") != [st.st_mtime_ns, st.st_size]:
+            return None
+        config = compiled.get("config")
+        return config if isinstance(config, dict) else None
+
     def _load_agent(self, config_path: Path, agent_path: Path) -> Optional[Agent]:
         """Load a single agent from config and instructions."""
-        with open(config_path) as f:
-            config = yaml.safe_load(f)
+        config = self._load_compiled_config(config_path)
+        if config is None:
+            with open(config_path, "rb") as f:
+                config = yaml.load(f, Loader=SafeLoader)
 
-        instructions = ""
-        if agent_path.exists():
-            instructions = agent_path.read_text()
+        if not isinstance(config, dict):
+            raise ValueError("config.yaml must contain a mapping")
 
-        # Extract keywords from triggers
-        keywords = config.get("triggers", {}).get("keywords", [])
+        instructions_path = agent_path if agent_path.exists() else None
 
-        # Extract runtime mode
-        runtime = config.get("runtime", {})
-        runtime_mode = runtime.get("mode", "on-demand")
+        # Read each section once; "or" also covers keys present but set to null
+        triggers = config.get("triggers") or {}
+        keywords = triggers.get("keywords") or []
+        if not isinstance(keywords, list):
+            raise ValueError("triggers.keywords must be a list")
+        runtime = config.get("runtime") or {}
 
         return Agent(
-            name=config.get("name", config_path.parent.name),
-            description=config.get("description", ""),
-            tier=config.get("tier", "tactical"),
-            category=config.get("category", "development"),
+            name=config.get("name") or config_path.parent.name,
+            description=config.get("description") or "",
+            tier=config.get("tier") or "tactical",
+            category=config.get("category") or "development",
             keywords=keywords,
-            requires_opus=config.get("requires_opus", False),
-            delegates_to=config.get("delegates_to", []),
-            runtime_mode=runtime_mode,
-            instructions=instructions,
+            requires_opus=bool(config.get("requires_opus")),
+            delegates_to=config.get("delegates_to") or [],
+            runtime_mode=runtime.get("mode") or "on-demand",
+            instructions_path=instructions_path,
         )
 
     def select_agent(
         self,
         task_description: str,
         explicit_agent: Optional[str] = None,
+        task_lower: Optional[str] = None,
     ) -> Optional[Agent]:
-        """Select the best agent for a task."""
+        """Select the best agent for a task.
+
+        Pass task_lower (e.g. from AgentContext) to skip re-lowercasing.
+        """
         # Priority 1: Explicit selection
         if explicit_agent:
             agent = self._agents.get(explicit_agent)
             if agent:
                 self.logger.info(f"Selected explicit agent: {explicit_agent}")
                 return agent
+            # The caller asked for a specific agent; don't guess a different one
             self.logger.warning(f"Requested agent not found: {explicit_agent}")
+            return None
+
+        if not task_description.strip():
+            self.logger.warning("Empty task description, no agent selected")
+            return None
 
         # Priority 2: Keyword matching
-        matches = []
-        for agent in self._agents.values():
-            score = agent.get_match_score(task_description)
-            if score > 0:
-                matches.append((score, agent))
+        if task_lower is None:
+            task_lower = task_description.lower()
+        if self._automaton is not None:
+            matches = self._match_automaton(task_lower)
+        else:
+            matches = []
+            for agent in self._agents.values():
+                score = agent._score_lowered(task_lower)
+                if score > 0:
+                    matches.append((score, agent))
 
         if matches:
             # Sort by score descending
@@ -233,9 +522,27 @@ class AgentLoader:
         self.logger.warning("No suitable agent found")
         return None
 
+    def _match_automaton(self, task_lower: str) -> List[tuple]:
+        """Score agents with a single pass of the keyword automaton."""
+        scores: Dict[str, int] = {}
+        seen = set()
+        for _, (kw, names) in self._automaton.iter(task_lower):
+            # Each keyword counts once, however often it occurs in the task
+            if kw in seen:
+                continue
+            seen.add(kw)
+            for name in names:
+                scores[name] = scores.get(name, 0) + 1
+
+        # Keep load order so ties resolve the same way as the linear scan
+        return [
+            (scores[name], self._agents[name])
+            for name in sorted(scores, key=self._agent_order.__getitem__)
+        ]
+
     def list_agents(self) -> List[str]:
         """Get list of all agent names."""
-        return sorted(self._agents.keys())
+        return list(self._sorted_agent_names)
 
     def get_agent(self, name: str) -> Optional[Agent]:
         """Get a specific agent by name."""
@@ -243,25 +550,12 @@ class AgentLoader:
 
     def get_agent_info(self, name: str) -> Optional[Dict[str, Any]]:
         """Get information about a specific agent."""
-        agent = self._agents.get(name)
-        if not agent:
-            return None
-
-        return {
-            "name": agent.name,
-            "description": agent.description,
-            "tier": agent.tier,
-            "category": agent.category,
-            "keywords": agent.keywords,
-            "requires_opus": agent.requires_opus,
-            "delegates_to": agent.delegates_to,
-            "runtime_mode": agent.runtime_mode,
-        }
+        return self._info_cache.get(name)
 
     def get_agents_by_tier(self, tier: str) -> List[Agent]:
         """Get all agents of a specific tier."""
-        return [a for a in self._agents.values() if a.tier == tier]
+        return list(self._by_tier.get(tier, []))
 
     def get_agents_by_category(self, category: str) -> List[Agent]:
         """Get all agents in a specific category."""
-        return [a for a in self._agents.values() if a.category == category]
+        return list(self._by_category.get(category, []))
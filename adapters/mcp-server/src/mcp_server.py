@@ -1,5 +1,7 @@
 """MCP server exposing Pleiades Agents as tools for Claude Code integration."""
 
+import functools
+import io
 import logging
 from typing import Any
 from mcp.server.models import InitializationOptions
@@ -18,9 +20,9 @@ mcp_server = Server("pleiades-agents")
 agent_loader = AgentLoader()
 
 
-@mcp_server.list_tools()
-async def list_tools() -> list[Tool]:
-    """List available Pleiades Agent tools."""
+@functools.lru_cache(maxsize=1)
+def _build_tools() -> list[Tool]:
+    """Build the tool schemas once; they never change at runtime."""
     tools = [
         Tool(
             name="select_pleiades_agent",
@@ -131,6 +133,60 @@ async def list_tools() -> list[Tool]:
     return tools
 
 
+@mcp_server.list_tools()
+async def list_tools() -> list[Tool]:
+    """List available Pleiades Agent tools."""
+    return _build_tools()
+
+
+@functools.lru_cache(maxsize=128)
+def _render_agent_list(tier_filter: str | None, category_filter: str | None, version: int) -> str:
+    """Render the agent listing; version keys the cache to a loader generation."""
+    # Read straight from the loader's tier indexes (already name-sorted).
+    # Any tier other than strategic is listed under Tactical.
+    if tier_filter == "strategic":
+        strategic = agent_loader.get_agents_by_tier("strategic")
+        tactical = []
+    elif tier_filter:
+        strategic = []
+        tactical = agent_loader.get_agents_by_tier(tier_filter)
+    else:
+        strategic = agent_loader.get_agents_by_tier("strategic")
+        tactical = [
+            agent for agent in map(agent_loader.get_agent, agent_loader.list_agents())
+            if agent.tier != "strategic"
+        ]
+
+    if category_filter:
+        strategic = [a for a in strategic if a.category == category_filter]
+        tactical = [a for a in tactical if a.category == category_filter]
+
+    buf = io.StringIO()
+    w = buf.write
+    w("## Available Pleiades Agents\n\n")
+
+    if strategic:
+        w(f"### Strategic Agents ({len(strategic)})\n\n")
+        for a in strategic:
+            w(f"**{a.name}** ({a.category})\n")
+            w(f"  {a.description}\n")
+            if a.delegates_to:
+                w(f"  Delegates to: {', '.join(a.delegates_to)}\n")
+            w("\n")
+
+    if tactical:
+        w(f"### Tactical Agents ({len(tactical)})\n\n")
+        for a in tactical:
+            w(f"**{a.name}** ({a.category})\n")
+            w(f"  {a.description}\n")
+            w("\n")
+
+    total = len(strategic) + len(tactical)
+    w(f"\n**Total**: {total} agents")
+
+    return buf.getvalue()
+
+
 @mcp_server.call_tool()
 async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent | ImageContent | EmbeddedResource]:
     """Handle tool calls from Claude Code."""
@@ -139,49 +195,8 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent |
         tier_filter = arguments.get("tier")
         category_filter = arguments.get("category")
 
-        agents = agent_loader.list_agents()
-        result = "## Available Pleiades Agents\n\n"
-
-        # Group by tier
-        strategic = []
-        tactical = []
-
-        for agent_name in agents:
-            info = agent_loader.get_agent_info(agent_name)
-            if not info:
-                continue
-
-            # Apply filters
-            if tier_filter and info["tier"] != tier_filter:
-                continue
-            if category_filter and info["category"] != category_filter:
-                continue
-
-            if info["tier"] == "strategic":
-                strategic.append(info)
-            else:
-                tactical.append(info)
-
-        if strategic:
-            result += f"### Strategic Agents ({len(strategic)})\n\n"
-            for info in strategic:
-                result += f"**{info['name']}** ({info['category']})\n"
-                result += f"  {info['description']}\n"
-                if info['delegates_to']:
-                    result += f"  Delegates to: {', '.join(info['delegates_to'])}\n"
-                result += "\n"
-
-        if tactical:
-            result += f"### Tactical Agents ({len(tactical)})\n\n"
-            for info in tactical:
-                result += f"**{info['name']}** ({info['category']})\n"
-                result += f"  {info['description']}\n"
-                result += "\n"
-
-        total = len(strategic) + len(tactical)
-        result += f"\n**Total**: {total} agents"
-
-        return [TextContent(type="text", text=result)]
+        text = _render_agent_list(tier_filter, category_filter, agent_loader.version)
+        return [TextContent(type="text", text=text)]
 
     elif name == "get_pleiades_agent_info":
         agent_name = arguments["agent_name"]
@@ -190,25 +205,25 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent |
         if not info:
             return [TextContent(type="text", text=f"Agent '{agent_name}' not found.")]
 
-        result = f"## {info['name']}\n\n"
-        result += f"**Description**: {info['description']}\n\n"
-        result += f"**Tier**: {info['tier']}\n"
-        result += f"**Category**: {info['category']}\n"
-        result += f"**Requires Opus**: {'Yes' if info['requires_opus'] else 'No'}\n"
-        result += f"**Runtime Mode**: {info['runtime_mode']}\n\n"
+        parts: list[str] = [
+            f"## {info['name']}\n\n",
+            f"**Description**: {info['description']}\n\n",
+            f"**Tier**: {info['tier']}\n",
+            f"**Category**: {info['category']}\n",
+            f"**Requires Opus**: {'Yes' if info['requires_opus'] else 'No'}\n",
+            f"**Runtime Mode**: {info['runtime_mode']}\n\n",
+        ]
 
         if info['keywords']:
-            result += "**Keywords**:\n"
-            for kw in info['keywords']:
-                result += f"- {kw}\n"
-            result += "\n"
+            parts.append("**Keywords**:\n")
+            parts.extend(f"- {kw}\n" for kw in info['keywords'])
+            parts.append("\n")
 
         if info['delegates_to']:
-            result += "**Delegates To**:\n"
-            for delegate in info['delegates_to']:
-                result += f"- {delegate}\n"
+            parts.append("**Delegates To**:\n")
+            parts.extend(f"- {delegate}\n" for delegate in info['delegates_to'])
 
-        return [TextContent(type="text", text=result)]
+        return [TextContent(type="text", text="".join(parts))]
 
     elif name == "get_agent_instructions":
         agent_name = arguments["agent_name"]
@@ -226,31 +241,43 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent |
         task_description = arguments["task_description"]
         explicit_agent = arguments.get("explicit_agent")
 
+        context = AgentContext(
+            task_description=task_description,
+            environment=arguments.get("environment"),
+            severity=arguments.get("severity")
+        )
+
         agent = agent_loader.select_agent(
             task_description=task_description,
-            explicit_agent=explicit_agent
+            explicit_agent=explicit_agent,
+            task_lower=context.task_lower
         )
 
         if not agent:
+            # An explicit request never falls back to keyword matching
+            if explicit_agent:
+                return [TextContent(type="text", text=f"Agent '{explicit_agent}' not found.")]
             return [TextContent(
                 type="text",
                 text=f"No suitable agent found for task: {task_description}"
             )]
 
-        matched = agent.get_matched_keywords(task_description)
+        matched = agent.get_matched_keywords(task_description, task_lower=context.task_lower)
 
-        result = f"## Selected Agent: {agent.name}\n\n"
-        result += f"**Description**: {agent.description}\n"
-        result += f"**Tier**: {agent.tier}\n"
-        result += f"**Category**: {agent.category}\n\n"
-        result += f"**Matched Keywords**: {', '.join(matched)}\n\n"
+        parts = [
+            f"## Selected Agent: {agent.name}\n\n",
+            f"**Description**: {agent.description}\n",
+            f"**Tier**: {agent.tier}\n",
+            f"**Category**: {agent.category}\n\n",
+            f"**Matched Keywords**: {', '.join(matched)}\n\n",
+        ]
 
         if agent.delegates_to:
-            result += f"**Can Delegate To**: {', '.join(agent.delegates_to)}\n\n"
+            parts.append(f"**Can Delegate To**: {', '.join(agent.delegates_to)}\n\n")
 
-        result += "Use `execute_pleiades_agent` to run this agent.\n"
+        parts.append("Use `execute_pleiades_agent` to run this agent.\n")
 
-        return [TextContent(type="text", text=result)]
+        return [TextContent(type="text", text="".join(parts))]
 
     elif name == "execute_pleiades_agent":
         agent_name = arguments["agent_name"]
@@ -277,36 +304,44 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent |
         logger.info(f"Executing agent: {agent_name}")
         result = agent.run(context)
 
-        output = f"## Agent Execution: {agent_name}\n\n"
-        output += f"**Status**: {result.status}\n"
-        output += f"**Message**: {result.message}\n\n"
+        parts = [
+            f"## Agent Execution: {agent_name}\n\n",
+            f"**Status**: {result.status}\n",
+            f"**Message**: {result.message}\n\n",
+        ]
 
         if result.analysis:
-            output += "### Analysis\n"
-            output += f"- **Tier**: {result.analysis.get('tier', 'N/A')}\n"
-            output += f"- **Category**: {result.analysis.get('category', 'N/A')}\n"
-            output += f"- **Matched Keywords**: {', '.join(result.analysis.get('matched_keywords', []))}\n"
+            parts.extend((
+                "### Analysis\n",
+                f"- **Tier**: {result.analysis.get('tier', 'N/A')}\n",
+                f"- **Category**: {result.analysis.get('category', 'N/A')}\n",
+                f"- **Matched Keywords**: {', '.join(result.analysis.get('matched_keywords', []))}\n",
+            ))
             if result.analysis.get('severity'):
-                output += f"- **Severity**: {result.analysis['severity']}\n"
-            output += "\n"
+                parts.append(f"- **Severity**: {result.analysis['severity']}\n")
+            parts.append("\n")
 
         if result.plan:
-            output += f"### Plan ({len(result.plan)} steps)\n"
+            parts.append(f"### Plan ({len(result.plan)} steps)\n")
             for step in result.plan:
                 delegation = f" → {step['delegate_to']}" if step.get('delegate_to') else ""
-                output += f"{step['step']}. {step['action']}{delegation}\n"
-            output += "\n"
+                parts.append(f"{step['step']}. {step['action']}{delegation}\n")
+            parts.append("\n")
 
         if result.delegations:
-            output += f"### Delegation Targets\n"
-            output += f"This agent can delegate to: {', '.join(result.delegations)}\n\n"
+            parts.extend((
+                "### Delegation Targets\n",
+                f"This agent can delegate to: {', '.join(result.delegations)}\n\n",
+            ))
 
         # Include instructions summary
-        if agent.instructions:
-            output += "### Agent Instructions Available\n"
-            output += "Use `get_agent_instructions` to view full instructions.\n"
+        if agent.has_instructions:
+            parts.extend((
+                "### Agent Instructions Available\n",
+                "Use `get_agent_instructions` to view full instructions.\n",
+            ))
 
-        return [TextContent(type="text", text=output)]
+        return [TextContent(type="text", text="".join(parts))]
 
     else:
         return [TextContent(type="text", text=f"Unknown tool: {name}")]
@@ -0,0 +1,103 @@
+"""Helpers shared by the guardian and skill migration scripts."""
+
+import functools
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# Below this many inputs, migrate serially instead of in worker processes
+PARALLEL_THRESHOLD = 8
+
+
+def compile_categories(categories: dict[str, list[str]]) -> tuple[re.Pattern, dict[str, str]]:
+    """Compile category keywords into one regex plus a group -> category map.
+
+    Each category is an anchored lookahead, tried in dict order, so the
+    first category with any matching keyword wins, as with a linear scan.
+    """
+    alternatives = []
+    groups = {}
+    for i, (category, keywords) in enumerate(categories.items()):
+        alternatives.append(f"(?=.*?(?P<c{i}>{'|'.join(map(re.escape, keywords))}))")
+        groups[f"c{i}"] = category
+    return re.compile("|".join(alternatives), re.DOTALL), groups
+
+
+def write_file(path: Path, data: bytes) -> None:
+    """Write already-serialized data with one unbuffered open/write/close."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+@functools.lru_cache(maxsize=1)
+def _yaml():
+    """Import PyYAML on first use; only the parent process writes YAML."""
+    import yaml
+
+    return yaml
+
+
+def dump_yaml(data: dict) -> bytes:
+    """Serialize a mapping as block-style YAML in insertion order."""
+    yaml = _yaml()
+    # Prefer libyaml's C emitter when PyYAML was built with it
+    dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+    return yaml.dump(
+        data, Dumper=dumper, default_flow_style=False, sort_keys=False, encoding="utf-8"
+    )
+
+
+@functools.lru_cache(maxsize=64)
+def _dump_runtime(items: tuple) -> bytes:
+    """Serialize the runtime block, memoized since agents share a few shapes."""
+    return dump_yaml({"runtime": dict(items)})
+
+
+def dump_config(config: dict) -> bytes:
+    """Serialize a config to YAML, splicing in the cached runtime block."""
+    # Top-level block mappings dumped separately concatenate cleanly
+    keys = list(config)
+    split = keys.index("runtime")
+    head = {k: config[k] for k in keys[:split]}
+    tail = {k: config[k] for k in keys[split + 1:]}
+
+    chunks = [_dump_runtime(tuple(config["runtime"].items()))]
+    if head:
+        chunks.insert(0, dump_yaml(head))
+    if tail:
+        chunks.append(dump_yaml(tail))
+    return b"".join(chunks)
+
+
+def map_inputs(func, inputs: list[Path]) -> list:
+    """Apply func to each input, in worker processes once there are enough."""
+    # Process start-up outweighs the parsing work for small batches
+    if len(inputs) < PARALLEL_THRESHOLD:
+        return [func(i) for i in inputs]
+
+    workers = os.cpu_count() or 1
+    chunksize = max(1, len(inputs) // (4 * workers))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(func, inputs, chunksize=chunksize))
+
+
+def write_results(results: list, write_agent) -> None:
+    """Write each migrated agent, then emit all status lines with one write.
+
+    results holds (name, config, agent_md, status line) tuples; entries
+    with no name were skipped and only report their status.
+    """
+    lines = []
+    for name, config, agent_md, status in results:
+        if name:
+            write_agent(name, config, agent_md)
+        lines.append(status)
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
@@ -2,10 +2,16 @@
 """Migrate Floor Guardian agents to unified agent format."""
 
 import ast
+import json
+import os
 import re
-import yaml
+import string
 from pathlib import Path
 
+from _migrate_common import (
+    compile_categories, dump_config, map_inputs, write_file, write_results,
+)
+
 # Source and target directories
 GUARDIANS_DIR = Path("/Users/fweir/git/internal/repos/nazarick-floor-guardians/src/floor_guardians/agents")
 AGENTS_DIR = Path("/Users/fweir/git/internal/repos/pleiades-agents/agents")
@@ -13,17 +19,47 @@ AGENTS_DIR = Path("/Users/fweir/git/internal/repos/pleiades-agents/agents")
 # Skip these files
 SKIP_FILES = {"__init__.py", "template.py"}
 
+# Returned by an attribute reader when the node isn't the expected literal
+_UNSET = object()
+
+
+def _read_const(node: ast.expr):
+    """Return the value of a literal constant node."""
+    return node.value if isinstance(node, ast.Constant) else _UNSET
+
+
+def _read_list(node: ast.expr):
+    """Return the constant elements of a list literal node."""
+    if not isinstance(node, ast.List):
+        return _UNSET
+    return [elt.value for elt in node.elts if isinstance(elt, ast.Constant)]
+
+
+# Guardian class attributes to extract, and how to read each one
+_ATTR_HANDLERS = {
+    "name": _read_const,
+    "expertise": _read_list,
+    "requires_opus": _read_const,
+    "description": _read_const,
+}
+
 
 def parse_python_class(file_path: Path) -> dict | None:
     """Parse Python file and extract class attributes."""
+    content = file_path.read_text()
+
+    # A guardian module must name its base class; skip parsing anything else
+    if "BaseFloorGuardian" not in content:
+        return None
+
     try:
-        content = file_path.read_text()
         tree = ast.parse(content)
     except SyntaxError:
         return None
 
-    # Find the class that inherits from BaseFloorGuardian
-    for node in ast.walk(tree):
+    # Find the class that inherits from BaseFloorGuardian. Guardians are
+    # always module-level, so method bodies are never traversed.
+    for node in tree.body:
         if not isinstance(node, ast.ClassDef):
             continue
 
@@ -42,85 +78,86 @@ def parse_python_class(file_path: Path) -> dict | None:
             "delegates_to": [],
         }
 
-        # Extract class attributes
+        # Extract class attributes, stopping once all of them are found
+        found = set()
         for item in node.body:
-            if isinstance(item, ast.Assign):
-                for target in item.targets:
-                    if not isinstance(target, ast.Name):
-                        continue
-                    name = target.id
-                    value = item.value
-
-                    if name == "name" and isinstance(value, ast.Constant):
-                        result["name"] = value.value
-                    elif name == "expertise" and isinstance(value, ast.List):
-                        result["expertise"] = [
-                            elt.value for elt in value.elts if isinstance(elt, ast.Constant)
-                        ]
-                    elif name == "requires_opus" and isinstance(value, ast.Constant):
-                        result["requires_opus"] = value.value
-                    elif name == "description" and isinstance(value, ast.Constant):
-                        result["description"] = value.value
-
-        # Extract delegate_to references from source
-        delegates = set()
-        for match in re.findall(r'"delegate_to":\s*"([^"]+)"', content):
-            delegates.add(match)
-        for match in re.findall(r"'delegate_to':\s*'([^']+)'", content):
-            delegates.add(match)
-        for match in re.findall(r'delegate_to_skill\(\s*skill_name=["\']([^"\']+)["\']', content):
-            delegates.add(match)
-        result["delegates_to"] = sorted(delegates)
+            if len(found) == len(_ATTR_HANDLERS):
+                break
+            if not isinstance(item, ast.Assign):
+                continue
+            for target in item.targets:
+                if not isinstance(target, ast.Name):
+                    continue
+                handler = _ATTR_HANDLERS.get(target.id)
+                if handler is None:
+                    continue
+                value = handler(item.value)
+                if value is not _UNSET:
+                    result[target.id] = value
+                    found.add(target.id)
+
+        result["delegates_to"] = extract_delegates(tree)
 
         return result
 
     return None
 
 
-def categorize_agent(name: str) -> str:
-    """Determine agent category based on name."""
-    categories = {
-        "crisis": ["incident"],
-        "security": ["security", "opsec", "git-history"],
-        "development": ["code-reviewer", "refactoring", "pattern"],
-        "architecture": ["architect", "api-designer", "integration"],
-        "operations": ["infrastructure", "ci-", "automation", "monitoring"],
-        "performance": ["performance", "dependency-analyzer"],
-        "planning": ["planner", "migration", "documentation-strategist", "testing-strategist", "tech-debt"],
-    }
-
-    for category, keywords in categories.items():
-        if any(kw in name for kw in keywords):
-            return category
-
-    return "development"
-
+def extract_delegates(tree: ast.Module) -> list[str]:
+    """Collect delegate targets from {"delegate_to": ...} and delegate_to_skill() calls."""
+    delegates = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Dict):
+            for key, value in zip(node.keys, node.values):
+                if (
+                    isinstance(key, ast.Constant) and key.value == "delegate_to"
+                    and isinstance(value, ast.Constant) and isinstance(value.value, str)
+                    and value.value
+                ):
+                    delegates.add(value.value)
+        elif isinstance(node, ast.Call):
+            func = node.func
+            func_name = func.id if isinstance(func, ast.Name) else getattr(func, "attr", None)
+            if func_name != "delegate_to_skill":
+                continue
+            for kw in node.keywords:
+                if (
+                    kw.arg == "skill_name"
+                    and isinstance(kw.value, ast.Constant) and isinstance(kw.value.value, str)
+                    and kw.value.value
+                ):
+                    delegates.add(kw.value.value)
+    return sorted(delegates)
+
+
+# Name substrings that identify each agent category, in priority order
+AGENT_CATEGORIES = {
+    "crisis": ["incident"],
+    "security": ["security", "opsec", "git-history"],
+    "development": ["code-reviewer", "refactoring", "pattern"],
+    "architecture": ["architect", "api-designer", "integration"],
+    "operations": ["infrastructure", "ci-", "automation", "monitoring"],
+    "performance": ["performance", "dependency-analyzer"],
+    "planning": ["planner", "migration", "documentation-strategist", "testing-strategist", "tech-debt"],
+}
+
+_AGENT_CATEGORIES_RE, _AGENT_CATEGORIES_GROUPS = compile_categories(AGENT_CATEGORIES)
 
-def generate_agent_md(info: dict) -> str:
-    """Generate AGENT.md content from parsed info."""
-    name = info["name"] or "unknown"
-    display_name = name.replace("-", " ").title()
-    desc = info["description"] or info["docstring"].split("\n")[0] if info["docstring"] else display_name
-    docstring = info["docstring"]
-    delegates = info["delegates_to"]
 
-    delegation_section = ""
-    if delegates:
-        delegate_list = "\n".join(f"- {d}" for d in delegates)
-        delegation_section = f"""
-## Delegation
+def categorize_agent(name: str) -> str:
+    """Determine agent category based on name."""
+    match = _AGENT_CATEGORIES_RE.match(name)
+    return _AGENT_CATEGORIES_GROUPS[match.lastgroup] if match else "development"
 
-This agent can delegate tactical tasks to:
-{delegate_list}
-"""
 
-    return f"""# {display_name}
+# AGENT.md skeleton shared by every migrated guardian
+AGENT_MD_TEMPLATE = string.Template("""# $display_name
 
-{desc}
+$desc
 
 ## Purpose
 
-{docstring if docstring else f"Strategic agent for {display_name.lower()} tasks."}
+$purpose
 
 ## Execution Pattern
 
@@ -145,11 +182,11 @@ This is a strategic agent following the four-phase execution model:
 - Track progress and verify outcomes
 - Adapt strategy if circumstances change
 - Document results and lessons learned
-{delegation_section}
+$delegation_section
 ## Activation
 
 This agent activates when prompts contain keywords related to:
-{chr(10).join(f"- {kw}" for kw in info["expertise"][:5])}
+$keywords_block
 
 ## Guidelines
 
@@ -158,8 +195,35 @@ This agent activates when prompts contain keywords related to:
 - Delegate tactical execution to specialized agents
 - Document decisions and reasoning
 - Verify outcomes against success criteria
+""")
+
+
+def generate_agent_md(info: dict) -> str:
+    """Generate AGENT.md content from parsed info."""
+    name = info["name"] or "unknown"
+    display_name = name.replace("-", " ").title()
+    desc = info["description"] or info["docstring"].split("\n")[0] if info["docstring"] else display_name
+    docstring = info["docstring"]
+    delegates = info["delegates_to"]
+
+    delegation_section = ""
+    if delegates:
+        delegate_list = "\n".join(f"- {d}" for d in delegates)
+        delegation_section = f"""
+## Delegation
+
+This agent can delegate tactical tasks to:
+{delegate_list}
 """
 
+    return AGENT_MD_TEMPLATE.substitute(
+        display_name=display_name,
+        desc=desc,
+        purpose=docstring if docstring else f"Strategic agent for {display_name.lower()} tasks.",
+        delegation_section=delegation_section,
+        keywords_block="\n".join(f"- {kw}" for kw in info["expertise"][:5]),
+    )
+
 
 def generate_config(info: dict) -> dict:
     """Generate config.yaml from parsed info."""
@@ -189,45 +253,119 @@ def generate_config(info: dict) -> dict:
     return config
 
 
-def migrate_guardian(file_path: Path) -> None:
-    """Migrate a single Floor Guardian to unified format."""
+def migrate_guardian(file_path: Path) -> tuple[str | None, dict | None, str | None, str]:
+    """Convert a single Floor Guardian to unified format.
+
+    Runs in a worker process, so nothing is written here. Returns
+    (name, config, agent_md, status line); name is None if skipped.
+    """
     info = parse_python_class(file_path)
     if not info or not info["name"]:
-        print(f"  [SKIP] Could not parse {file_path.name}")
-        return
+        return None, None, None, f"  [SKIP] Could not parse {file_path.name}"
 
     name = info["name"]
+    config = generate_config(info)
+    agent_md = generate_agent_md(info)
 
+    delegates = f" → {', '.join(info['delegates_to'])}" if info["delegates_to"] else ""
+    return name, config, agent_md, f"  [OK] {name}{delegates}"
+
+
+# config.yaml layout produced by generate_config
+CONFIG_TEMPLATE = string.Template("""\
+name: $name
+description: $description
+version: $version
+status: $status
+tier: $tier
+category: $category
+requires_opus: $requires_opus
+triggers:
+  keywords:$keywords
+runtime:
+  mode: $mode
+  preferred: $preferred
+  fallback: $fallback
+$delegates_to""")
+
+# Strings that can be written unquoted without YAML reading them as
+# anything else: lowercase words, digits and dashes, starting with a letter
+_PLAIN_SCALAR = re.compile(r"[a-z][a-z0-9-]*(?: [a-z0-9-]+)*")
+_YAML_KEYWORDS = frozenset({"yes", "no", "on", "off", "true", "false", "null"})
+
+
+def _yaml_str(value: str) -> str:
+    """Format a string as a YAML scalar; JSON strings are valid YAML."""
+    if _PLAIN_SCALAR.fullmatch(value) and value not in _YAML_KEYWORDS:
+        return value
+    return json.dumps(value)
+
+
+def _yaml_list(values: list[str], indent: str) -> str:
+    """Format a list as a block sequence following its key."""
+    if not values:
+        return " []"
+    return "".join(f"\n{indent}- {_yaml_str(v)}" for v in values)
+
+
+def render_config(config: dict) -> bytes:
+    """Serialize a generate_config() result without going through PyYAML.
+
+    Values outside the fast path (non-ASCII or non-string scalars) fall
+    back to dump_config, so the output always loads back to config.
+    """
+    runtime = config["runtime"]
+    keywords = config["triggers"]["keywords"]
+    delegates = config.get("delegates_to", [])
+    strings = [
+        config["name"], config["description"], config["version"], config["status"],
+        config["tier"], config["category"], *runtime.values(), *keywords, *delegates,
+    ]
+    if not isinstance(config["requires_opus"], bool) or not all(
+        isinstance(s, str) and s.isascii() and "\x7f" not in s for s in strings
+    ):
+        return dump_config(config)
+
+    return CONFIG_TEMPLATE.substitute(
+        name=_yaml_str(config["name"]),
+        description=_yaml_str(config["description"]),
+        version=_yaml_str(config["version"]),
+        status=_yaml_str(config["status"]),
+        tier=_yaml_str(config["tier"]),
+        category=_yaml_str(config["category"]),
+        requires_opus="true" if config["requires_opus"] else "false",
+        keywords=_yaml_list(keywords, "  "),
+        mode=_yaml_str(runtime["mode"]),
+        preferred=_yaml_str(runtime["preferred"]),
+        fallback=_yaml_str(runtime["fallback"]),
+        delegates_to=f"delegates_to:{_yaml_list(delegates, '')}\n" if delegates else "",
+    ).encode()
+
+
+def write_agent(name: str, config: dict, agent_md: str) -> None:
+    """Write config.yaml and AGENT.md for a migrated agent."""
     # Create target directory
     target_dir = AGENTS_DIR / name
     target_dir.mkdir(parents=True, exist_ok=True)
 
     # Write config.yaml
-    config = generate_config(info)
-    config_path = target_dir / "config.yaml"
-    with open(config_path, "w") as f:
-        yaml.dump(config, f, default_flow_style=False, sort_keys=False)
+    write_file(target_dir / "config.yaml", render_config(config))
 
     # Write AGENT.md
-    agent_md = generate_agent_md(info)
-    agent_path = target_dir / "AGENT.md"
-    agent_path.write_text(agent_md)
-
-    delegates = f" → {', '.join(info['delegates_to'])}" if info["delegates_to"] else ""
-    print(f"  [OK] {name}{delegates}")
+    write_file(target_dir / "AGENT.md", agent_md.encode())
 
 
 def main():
     print("Migrating Floor Guardian agents to unified format...\n")
 
-    agent_files = sorted([
-        f for f in GUARDIANS_DIR.glob("*.py")
-        if f.name not in SKIP_FILES
-    ])
+    with os.scandir(GUARDIANS_DIR) as it:
+        agent_files = sorted(
+            Path(e.path) for e in it
+            if e.name.endswith(".py") and e.name not in SKIP_FILES and e.is_file()
+        )
     print(f"Found {len(agent_files)} agents to migrate:\n")
 
-    for agent_file in agent_files:
-        migrate_guardian(agent_file)
+    write_results(map_inputs(migrate_guardian, agent_files), write_agent)
 
     print(f"\nMigration complete! Check {AGENTS_DIR} for results.")
 
@@ -1,10 +1,14 @@
 #!/usr/bin/env python3
 """Migrate Pleiades Squad skills to unified agent format."""
 
-import re
+import os
 import yaml
 from pathlib import Path
 
+from _migrate_common import (
+    compile_categories, dump_config, map_inputs, write_file, write_results,
+)
+
 # Source and target directories
 SKILLS_DIR = Path("/Users/fweir/git/internal/repos/nazarick-pleiades-squad/.claude/skills")
 AGENTS_DIR = Path("/Users/fweir/git/internal/repos/pleiades-agents/agents")
@@ -17,20 +21,27 @@ STABLE_SKILLS = {
     "writing-style-analyzer",
 }
 
+# Prefer libyaml's C parser when PyYAML was built with it
+SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 def parse_skill_file(skill_path: Path) -> tuple[dict, str]:
     """Parse YAML frontmatter and content from skill file."""
     content = skill_path.read_text()
 
-    # Split frontmatter from content
-    if content.startswith("---"):
-        parts = content.split("---", 2)
-        if len(parts) >= 3:
-            frontmatter = yaml.safe_load(parts[1])
-            markdown = parts[2].strip()
-            return frontmatter, markdown
+    # No opening delimiter means no frontmatter; don't search the body
+    if not content.startswith("---"):
+        return {}, content
 
-    return {}, content
+    # Slice out the frontmatter up to its closing delimiter line, without
+    # splitting (and copying) the whole document
+    end = content.find("\n---", 3)
+    if end == -1:
+        return {}, content
+
+    frontmatter = yaml.load(content[3:end], Loader=SafeLoader)
+    markdown = content[end + 4:].strip()
+    return frontmatter, markdown
 
 
 def convert_to_config(frontmatter: dict, skill_name: str) -> dict:
@@ -56,58 +67,62 @@ def convert_to_config(frontmatter: dict, skill_name: str) -> dict:
     }
 
 
+# Name substrings that identify each skill category, in priority order
+SKILL_CATEGORIES = {
+    "git": ["commit", "branch", "merge", "pr-", "changelog"],
+    "security": ["secret", "vulnerability", "opsec"],
+    "code-quality": ["lint", "style", "deduplic", "tech-debt"],
+    "testing": ["test"],
+    "documentation": ["doc", "api-doc", "writing-style"],
+    "infrastructure": ["docker", "config", "env-"],
+    "dependencies": ["dependency"],
+    "compliance": ["license"],
+    "data": ["metadata"],
+}
+
+_SKILL_CATEGORIES_RE, _SKILL_CATEGORIES_GROUPS = compile_categories(SKILL_CATEGORIES)
+
+
 def categorize_skill(name: str) -> str:
     """Determine skill category based on name."""
-    categories = {
-        "git": ["commit", "branch", "merge", "pr-", "changelog"],
-        "security": ["secret", "vulnerability", "opsec"],
-        "code-quality": ["lint", "style", "deduplic", "tech-debt"],
-        "testing": ["test"],
-        "documentation": ["doc", "api-doc", "writing-style"],
-        "infrastructure": ["docker", "config", "env-"],
-        "dependencies": ["dependency"],
-        "compliance": ["license"],
-        "data": ["metadata"],
-    }
+    match = _SKILL_CATEGORIES_RE.match(name)
+    return _SKILL_CATEGORIES_GROUPS[match.lastgroup] if match else "development"
 
-    for category, keywords in categories.items():
-        if any(kw in name for kw in keywords):
-            return category
 
-    return "development"
+def migrate_skill(skill_dir: Path) -> tuple[str | None, dict | None, str | None, str]:
+    """Convert a single skill to unified format.
 
-
-def migrate_skill(skill_dir: Path) -> None:
-    """Migrate a single skill to unified format."""
+    Runs in a worker process, so nothing is written here. Returns
+    (name, config, agent_md, status line); name is None if skipped.
+    """
     skill_name = skill_dir.name
 
     # Find skill file (case-insensitive)
     skill_files = list(skill_dir.glob("*.md"))
     if not skill_files:
-        print(f"  [SKIP] No .md file in {skill_name}")
-        return
+        return None, None, None, f"  [SKIP] No .md file in {skill_name}"
 
     skill_file = skill_files[0]
 
     # Parse skill
     frontmatter, markdown = parse_skill_file(skill_file)
+    config = convert_to_config(frontmatter, skill_name)
+
+    status = config["status"]
+    return skill_name, config, markdown, f"  [OK] {skill_name} ({status})"
 
+
+def write_agent(name: str, config: dict, agent_md: str) -> None:
+    """Write config.yaml and AGENT.md for a migrated agent."""
     # Create target directory
-    target_dir = AGENTS_DIR / skill_name
+    target_dir = AGENTS_DIR / name
     target_dir.mkdir(parents=True, exist_ok=True)
 
     # Write config.yaml
-    config = convert_to_config(frontmatter, skill_name)
-    config_path = target_dir / "config.yaml"
-    with open(config_path, "w") as f:
-        yaml.dump(config, f, default_flow_style=False, sort_keys=False)
+    write_file(target_dir / "config.yaml", dump_config(config))
 
     # Write AGENT.md (markdown content without frontmatter)
-    agent_path = target_dir / "AGENT.md"
-    agent_path.write_text(markdown)
-
-    status = config["status"]
-    print(f"  [OK] {skill_name} ({status})")
+    write_file(target_dir / "AGENT.md", agent_md.encode())
 
 
 def main():
@@ -115,11 +130,11 @@ def main():
 
     AGENTS_DIR.mkdir(parents=True, exist_ok=True)
 
-    skill_dirs = sorted([d for d in SKILLS_DIR.iterdir() if d.is_dir()])
+    with os.scandir(SKILLS_DIR) as it:
+        skill_dirs = sorted(Path(e.path) for e in it if e.is_dir())
     print(f"Found {len(skill_dirs)} skills to migrate:\n")
 
-    for skill_dir in skill_dirs:
-        migrate_skill(skill_dir)
+    write_results(map_inputs(migrate_skill, skill_dirs), write_agent)
 
     print(f"\nMigration complete! {len(skill_dirs)} skills migrated to {AGENTS_DIR}")
 
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Check that hand-rendered guardian configs load back to the same data."""
+
+import importlib.util
+import sys
+import yaml
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).parent.parent
+MIGRATE_GUARDIANS = REPO_ROOT / "scripts" / "migrate_guardians.py"
+
+
+def load_migrate_guardians():
+    """Import scripts/migrate_guardians.py, which is not a package module."""
+    # The script imports its sibling helpers the way running it directly would
+    sys.path.insert(0, str(MIGRATE_GUARDIANS.parent))
+    spec = importlib.util.spec_from_file_location("migrate_guardians", MIGRATE_GUARDIANS)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def make_info(name="test-agent", description="", requires_opus=True, expertise=(), delegates_to=()):
+    """Build parse_python_class() output for generate_config()."""
+    return {
+        "name": name,
+        "description": description,
+        "requires_opus": requires_opus,
+        "expertise": list(expertise),
+        "delegates_to": list(delegates_to),
+    }
+
+
+# (label, parse_python_class() output) rendered by the template
+FAST_PATH_CASES = [
+    ("plain words", make_info(expertise=["incident", "security audit", "ci-debug"])),
+    ("empty lists", make_info()),
+    ("yaml keywords", make_info(
+        description="null",
+        expertise=["yes", "no", "on", "off", "true", "false", "null", "~", "y", "n"],
+    )),
+    ("numbers and dates", make_info(expertise=["1.0", "0x1f", "12:30", "2024-01-01", "1e3"])),
+    ("indicators", make_info(
+        description="Reviews code: style, #tags & more",
+        expertise=["a: b", "a #b", "#comment", "- dash", "*alias", "&anchor", "!tag", "[x]", "{y}", "|", ">", "%", "@", "`"],
+    )),
+    ("quotes", make_info(description="it's \"quoted\"", expertise=["'single'", '"double"', "back\\slash"])),
+    ("whitespace", make_info(expertise=["", " lead", "trail ", "two  spaces", "tab\there", "line\nbreak"])),
+    ("control characters", make_info(expertise=["nul\x00", "bell\x07", "esc\x1b", "del\x7f"])),
+    ("delegates", make_info(delegates_to=["documentation-writer", "Needs Quotes", "yes"])),
+    ("requires_opus false", make_info(requires_opus=False, expertise=["opsec"])),
+]
+
+# Cases outside the template's fast path, which must go through dump_config
+FALLBACK_CASES = [
+    ("non-ASCII description", make_info(description="café")),
+    ("non-BMP keyword", make_info(expertise=["ship it \U0001F680"])),
+    ("non-ASCII delegate", make_info(delegates_to=["naïve-agent"])),
+    ("non-string keyword", make_info(expertise=["ok", 3, None])),
+    ("non-bool requires_opus", make_info(requires_opus=None)),
+]
+
+
+def main():
+    print("Checking guardian config round-trips...\n")
+
+    migrate = load_migrate_guardians()
+    failures = []
+
+    for cases, expect_fallback in ((FAST_PATH_CASES, False), (FALLBACK_CASES, True)):
+        for label, info in cases:
+            config = migrate.generate_config(info)
+            rendered = migrate.render_config(config)
+
+            loaded = yaml.safe_load(rendered)
+            if loaded != config:
+                failures.append(f"{label}: loaded {loaded!r}, expected {config!r}")
+                continue
+
+            if expect_fallback and rendered != migrate.dump_config(config):
+                failures.append(f"{label}: expected the dump_config fallback")
+                continue
+
+            print(f"  [OK]    {label}")
+
+    for failure in failures:
+        print(f"  [ERROR] {failure}")
+
+    if failures:
+        print(f"\nRound-trip check FAILED with {len(failures)} errors")
+        sys.exit(1)
+    else:
+        print(f"\nRound-trip check PASSED")
+        sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,41 +1,57 @@
 #!/usr/bin/env python3
 """Validate all agents have correct structure and configuration."""
 
+import functools
+import os
 import sys
-import yaml
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 REPO_ROOT = Path(__file__).parent.parent
 AGENTS_DIR = REPO_ROOT / "agents"
 
 # Required fields in config.yaml
-REQUIRED_FIELDS = {"name", "description", "tier", "triggers"}
-VALID_TIERS = {"strategic", "tactical"}
-VALID_MODES = {"on-demand", "preload"}
-VALID_STATUS = {"stable", "draft"}
-VALID_RUNTIMES = {"claude-native", "gemini-cli", "mcp", "claude-api"}
+REQUIRED_FIELDS = frozenset({"name", "description", "tier", "triggers"})
+VALID_TIERS = frozenset({"strategic", "tactical"})
+VALID_MODES = frozenset({"on-demand", "preload"})
+VALID_STATUS = frozenset({"stable", "draft"})
+VALID_RUNTIMES = frozenset({"claude-native", "gemini-cli", "mcp", "claude-api"})
 
 
-def validate_agent(agent_dir: Path) -> list[str]:
-    """Validate a single agent directory."""
+@functools.lru_cache(maxsize=1)
+def _yaml():
+    """Import PyYAML on first use, so early exits skip loading it."""
+    import yaml
+
+    return yaml
+
+
+def validate_agent(agent_dir: Path) -> tuple[list[str], dict | None]:
+    """Validate a single agent directory.
+
+    Returns the errors found and the parsed config (None if unreadable).
+    """
     errors = []
     agent_name = agent_dir.name
 
-    config_path = agent_dir / "config.yaml"
-    agent_path = agent_dir / "AGENT.md"
+    # One directory listing answers every existence check below
+    with os.scandir(agent_dir) as it:
+        entries = {e.name: e for e in it}
 
     # Check config.yaml exists
-    if not config_path.exists():
+    if "config.yaml" not in entries:
         errors.append(f"{agent_name}: Missing config.yaml")
-        return errors
+        return errors, None
 
     # Parse config.yaml
+    yaml = _yaml()
     try:
-        with open(config_path) as f:
-            config = yaml.safe_load(f)
+        with open(entries["config.yaml"].path) as f:
+            # Prefer libyaml's C parser when PyYAML was built with it
+            config = yaml.load(f, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
     except yaml.YAMLError as e:
         errors.append(f"{agent_name}: Invalid YAML in config.yaml: {e}")
-        return errors
+        return errors, None
 
     # Check required fields
     for field in REQUIRED_FIELDS:
@@ -49,7 +65,7 @@ def validate_agent(agent_dir: Path) -> list[str]:
     # Validate tier
     tier = config.get("tier")
     if tier and tier not in VALID_TIERS:
-        errors.append(f"{agent_name}: Invalid tier '{tier}' (must be: {VALID_TIERS})")
+        errors.append(f"{agent_name}: Invalid tier '{tier}' (must be: {set(VALID_TIERS)})")
 
     # Validate runtime structure (v2 schema)
     runtime = config.get("runtime", {})
@@ -57,29 +73,30 @@ def validate_agent(agent_dir: Path) -> list[str]:
     # Check mode
     mode = runtime.get("mode")
     if mode and mode not in VALID_MODES:
-        errors.append(f"{agent_name}: Invalid runtime mode '{mode}' (must be: {VALID_MODES})")
+        errors.append(f"{agent_name}: Invalid runtime mode '{mode}' (must be: {set(VALID_MODES)})")
 
     # Check discovery field (v2 schema)
     discovery = runtime.get("discovery")
     if discovery:
         if discovery not in VALID_RUNTIMES:
-            errors.append(f"{agent_name}: Invalid discovery runtime '{discovery}' (must be: {VALID_RUNTIMES})")
+            errors.append(f"{agent_name}: Invalid discovery runtime '{discovery}' (must be: {set(VALID_RUNTIMES)})")
 
     # Check execution field (v2 schema)
     execution = runtime.get("execution", {})
     if execution:
         preferred = execution.get("preferred")
         if preferred and preferred not in VALID_RUNTIMES:
-            errors.append(f"{agent_name}: Invalid execution.preferred '{preferred}' (must be: {VALID_RUNTIMES})")
+            errors.append(f"{agent_name}: Invalid execution.preferred '{preferred}' (must be: {set(VALID_RUNTIMES)})")
 
         fallbacks = execution.get("fallbacks", [])
         if fallbacks:
             if not isinstance(fallbacks, list):
                 errors.append(f"{agent_name}: execution.fallbacks must be a list")
             else:
-                for fb in fallbacks:
-                    if fb not in VALID_RUNTIMES:
-                        errors.append(f"{agent_name}: Invalid fallback runtime '{fb}' (must be: {VALID_RUNTIMES})")
+                errors.extend(
+                    f"{agent_name}: Invalid fallback runtime '{fb}' (must be: {set(VALID_RUNTIMES)})"
+                    for fb in fallbacks if fb not in VALID_RUNTIMES
+                )
 
     # Warn if using old schema (preferred/fallback at runtime level)
     if "preferred" in runtime and "execution" not in runtime:
@@ -90,7 +107,7 @@ def validate_agent(agent_dir: Path) -> list[str]:
     # Validate status
     status = config.get("status")
     if status and status not in VALID_STATUS:
-        errors.append(f"{agent_name}: Invalid status '{status}' (must be: {VALID_STATUS})")
+        errors.append(f"{agent_name}: Invalid status '{status}' (must be: {set(VALID_STATUS)})")
 
     # Validate keywords
     triggers = config.get("triggers", {})
@@ -101,10 +118,10 @@ def validate_agent(agent_dir: Path) -> list[str]:
         errors.append(f"{agent_name}: keywords must be a list")
 
     # Check AGENT.md exists (warning, not error)
-    if not agent_path.exists():
+    if "AGENT.md" not in entries:
         errors.append(f"{agent_name}: [WARN] Missing AGENT.md")
 
-    return errors
+    return errors, config
 
 
 def main():
@@ -114,7 +131,8 @@ def main():
         print(f"Error: Agents directory not found: {AGENTS_DIR}")
         sys.exit(1)
 
-    agent_dirs = sorted([d for d in AGENTS_DIR.iterdir() if d.is_dir()])
+    with os.scandir(AGENTS_DIR) as it:
+        agent_dirs = sorted(Path(e.path) for e in it if e.is_dir())
     print(f"Found {len(agent_dirs)} agents to validate\n")
 
     all_errors = []
@@ -125,36 +143,42 @@ def main():
     tactical_count = 0
     v2_schema_count = 0
 
-    for agent_dir in agent_dirs:
-        errors = validate_agent(agent_dir)
+    # Overlap file reads and YAML parsing; map() yields results in
+    # directory order, so reporting below stays on this thread
+    max_workers = min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(validate_agent, agent_dirs))
+
+    # Collect the per-agent report and emit it with a single write
+    lines = []
+    for agent_dir, (errors, config) in zip(agent_dirs, results):
         warnings = [e for e in errors if "[WARN]" in e]
         real_errors = [e for e in errors if "[WARN]" not in e]
 
         if real_errors:
-            for error in real_errors:
-                print(f"  [ERROR] {error}")
+            lines.extend(f"  [ERROR] {error}" for error in real_errors)
             all_errors.extend(real_errors)
         elif warnings:
-            print(f"  [WARN]  {agent_dir.name}")
+            lines.append(f"  [WARN]  {agent_dir.name}")
             warning_count += 1
         else:
-            print(f"  [OK]    {agent_dir.name}")
+            lines.append(f"  [OK]    {agent_dir.name}")
             valid_count += 1
 
         # Count tiers and schema versions
-        config_path = agent_dir / "config.yaml"
-        if config_path.exists():
-            with open(config_path) as f:
-                config = yaml.safe_load(f)
-                if config.get("tier") == "strategic":
-                    strategic_count += 1
-                else:
-                    tactical_count += 1
-
-                # Check for v2 schema
-                runtime = config.get("runtime", {})
-                if "execution" in runtime:
-                    v2_schema_count += 1
+        if config is not None:
+            if config.get("tier") == "strategic":
+                strategic_count += 1
+            else:
+                tactical_count += 1
+
+            # Check for v2 schema
+            runtime = config.get("runtime", {})
+            if "execution" in runtime:
+                v2_schema_count += 1
+
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
 
     print(f"\n{'=' * 50}")
     print(f"Summary:")